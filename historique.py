@@ -0,0 +1,219 @@
+"""
+Historique local des captures tcpdump (base SQLite, ajout seulement).
+
+Chaque capture est agrégée par minute, hôte source, hôte destination, port
+destination et flags TCP (le port source, éphémère, n'est pas gardé) puis ajoutée une seule fois à la base : l'empreinte SHA-256 du fichier sert
+à reconnaître une capture déjà importée. Les rapports et graphiques peuvent
+ensuite interroger n'importe quelle période sans relire les fichiers tcpdump.
+
+Exemple :
+    connexion = historique.ouvrir('captures.db')
+    historique.importer_capture(connexion, 'tcpdump.txt', records, date(2024, 1, 10), 50)
+    historique.paquets_par_source(connexion, '2024-01-10 00:00', '2024-01-11 00:00')
+"""
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY,
+    empreinte TEXT NOT NULL UNIQUE,
+    fichier TEXT NOT NULL,
+    debut TEXT,
+    fin TEXT,
+    paquets INTEGER NOT NULL,
+    importe_le TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS agregats (
+    capture_id INTEGER NOT NULL REFERENCES captures(id),
+    minute TEXT NOT NULL,
+    source TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    port_destination TEXT NOT NULL,
+    flags TEXT NOT NULL,
+    paquets INTEGER NOT NULL,
+    octets INTEGER NOT NULL,
+    paquets_courts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_agregats_minute ON agregats(minute);
+CREATE INDEX IF NOT EXISTS idx_agregats_source ON agregats(source, minute);
+CREATE INDEX IF NOT EXISTS idx_agregats_destination ON agregats(destination, minute);
+"""
+
+FORMAT_MINUTE = '%Y-%m-%d %H:%M'
+
+
+def ouvrir(chemin):
+    """
+    Ouvre (et crée si besoin) la base d'historique.
+    """
+    connexion = sqlite3.connect(chemin)
+    connexion.executescript(SCHEMA)
+    return connexion
+
+
+def empreinte_fichier(nom_fichier):
+    """
+    Calcule l'empreinte SHA-256 du fichier, lu par blocs.
+    """
+    sha = hashlib.sha256()
+    with open(nom_fichier, 'rb') as f:
+        for bloc in iter(lambda: f.read(1 << 16), b''):
+            sha.update(bloc)
+    return sha.hexdigest()
+
+
+def separer_port(adresse):
+    """
+    Sépare l'adresse tcpdump 'hôte.port' en (hôte, port). Le port peut être
+    un numéro ou un nom de service (https) ; l'hôte une IPv4, une IPv6 ou un nom.
+    """
+    hote, _, port = adresse.rpartition('.')
+    if not hote:
+        return adresse, ''
+    return hote, port
+
+
+def passages_minuit(records):
+    """
+    Compte le nombre de fois où l'heure revient en arrière dans la capture,
+    c'est-à-dire le nombre de minuits traversés.
+    """
+    passages = 0
+    heure_precedente = None
+    for record in records:
+        heure = record["Heure"][:5]
+        if heure_precedente is not None and heure < heure_precedente:
+            passages += 1
+        heure_precedente = heure
+    return passages
+
+
+def date_debut_capture(date_fin, records):
+    """
+    Retrouve le jour de début de la capture à partir du jour de fin
+    (par exemple la date de modification du fichier).
+    """
+    return date_fin - timedelta(days=passages_minuit(records))
+
+
+def agreger_par_minute(records, date_capture, taille_paquet_court):
+    """
+    Agrège les paquets par (minute, hôte source, hôte destination,
+    port destination, flags).
+
+    tcpdump n'écrit que l'heure : la date de début de capture est fournie et
+    on passe au jour suivant quand l'heure revient en arrière (minuit).
+    """
+    agregats = {}
+    jour = date_capture
+    heure_precedente = None
+
+    for record in records:
+        heure = record["Heure"][:5]
+        if heure_precedente is not None and heure < heure_precedente:
+            jour += timedelta(days=1)
+        heure_precedente = heure
+
+        source, _ = separer_port(record["IP Source"])
+        destination, port_destination = separer_port(record["IP Destination"])
+        cle = (f"{jour.isoformat()} {heure}", source, destination, port_destination, record["Flags"])
+        valeurs = agregats.setdefault(cle, [0, 0, 0])
+        valeurs[0] += 1
+        valeurs[1] += record["Longueur"]
+        if record["Longueur"] < taille_paquet_court:
+            valeurs[2] += 1
+
+    return agregats
+
+
+def importer_capture(connexion, nom_fichier, records, date_capture, taille_paquet_court):
+    """
+    Ajoute une capture à l'historique. Retourne l'identifiant de la capture,
+    ou None si ce fichier a déjà été importé.
+    """
+    empreinte = empreinte_fichier(nom_fichier)
+    agregats = agreger_par_minute(records, date_capture, taille_paquet_court)
+    minutes = [cle[0] for cle in agregats]
+
+    with connexion:
+        # La contrainte UNIQUE fait le tri dans la transaction : deux imports
+        # simultanés du même fichier n'ajoutent la capture qu'une fois
+        curseur = connexion.execute(
+            "INSERT OR IGNORE INTO captures (empreinte, fichier, debut, fin, paquets, importe_le) VALUES (?, ?, ?, ?, ?, ?)",
+            (empreinte, nom_fichier, min(minutes, default=None), max(minutes, default=None), len(records),
+             datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        )
+        if curseur.rowcount == 0:
+            return None
+        capture_id = curseur.lastrowid
+        connexion.executemany(
+            "INSERT INTO agregats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((capture_id, *cle, *valeurs) for cle, valeurs in agregats.items())
+        )
+    return capture_id
+
+
+def _filtre(debut, fin, hote):
+    """
+    Construit la clause WHERE commune aux requêtes. debut est inclus,
+    fin est exclue ; les deux sont au format 'YYYY-MM-DD HH:MM' ou 'YYYY-MM-DD'.
+    """
+    conditions, parametres = [], []
+    if debut:
+        conditions.append("minute >= ?")
+        parametres.append(debut)
+    if fin:
+        conditions.append("minute < ?")
+        parametres.append(fin)
+    if hote:
+        conditions.append("(source = ? OR destination = ?)")
+        parametres += [hote, hote]
+    return (" WHERE " + " AND ".join(conditions)) if conditions else "", parametres
+
+
+def resume(connexion, debut=None, fin=None, hote=None):
+    """
+    Retourne le nombre total de paquets et d'adresses source/destination uniques.
+    """
+    where, parametres = _filtre(debut, fin, hote)
+    paquets, sources, destinations = connexion.execute(
+        "SELECT COALESCE(SUM(paquets), 0), COUNT(DISTINCT source), COUNT(DISTINCT destination) FROM agregats" + where,
+        parametres
+    ).fetchone()
+    return {'paquets': paquets, 'sources': sources, 'destinations': destinations}
+
+
+def paquets_par_source(connexion, debut=None, fin=None, hote=None, courts=False, limite=None):
+    """
+    Retourne [(source, paquets)] trié par nombre décroissant. Avec courts=True,
+    seuls les paquets courts sont comptés.
+    """
+    where, parametres = _filtre(debut, fin, hote)
+    colonne = "paquets_courts" if courts else "paquets"
+    requete = (f"SELECT source, SUM({colonne}) AS total FROM agregats{where} "
+               "GROUP BY source HAVING total > 0 ORDER BY total DESC")
+    if limite:
+        requete += f" LIMIT {int(limite)}"
+    return connexion.execute(requete, parametres).fetchall()
+
+
+def paquets_par_flags(connexion, debut=None, fin=None, hote=None):
+    """
+    Retourne [(flags, paquets)] pour la période.
+    """
+    where, parametres = _filtre(debut, fin, hote)
+    return connexion.execute(
+        f"SELECT flags, SUM(paquets) FROM agregats{where} GROUP BY flags ORDER BY 2 DESC", parametres
+    ).fetchall()
+
+
+def paquets_par_minute(connexion, debut=None, fin=None, hote=None):
+    """
+    Retourne [(minute, paquets, octets)] dans l'ordre chronologique.
+    """
+    where, parametres = _filtre(debut, fin, hote)
+    return connexion.execute(
+        f"SELECT minute, SUM(paquets), SUM(octets) FROM agregats{where} GROUP BY minute ORDER BY minute", parametres
+    ).fetchall()
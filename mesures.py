@@ -0,0 +1,192 @@
+"""
+Instrumentation des traitements : durée de chaque étape et compteurs.
+
+Désactivée par défaut : tant que activer() n'a pas été appelée, etape()
+retourne un contexte vide et compter() ne fait rien, ce qui rend le coût
+négligeable. Les boucles de lecture comptent dans des variables locales et
+n'appellent compter() qu'une fois à la fin.
+
+Exemple :
+    import mesures
+    mesures.activer()
+    with mesures.etape('lecture_ics'):
+        ...
+    mesures.compter('ics_evenements', 694)
+    mesures.ecrire('json', 'mesures.json')
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+_actif = False
+_etapes = {}  # nom -> [durée cumulée en secondes, nombre d'appels]
+_compteurs = Counter()
+_memoire = {}  # nom -> pic d'allocation en octets (tracemalloc)
+_etape_profil = None
+_fichier_profil = None
+_etape_memoire = None
+_profil = None  # un seul cProfile.Profile pour toute l'exécution
+
+# Les serveurs multi-thread mesurent depuis plusieurs threads : les écritures
+# sont protégées, mais seulement quand les mesures sont actives
+_verrou = threading.Lock()
+# Un profileur ne peut être actif que dans un passage à la fois
+_verrou_profil = threading.Lock()
+
+_CONTEXTE_VIDE = nullcontext()
+
+
+def activer(etape_profil=None, fichier_profil=None, etape_memoire=None):
+    """
+    Active les mesures. Si etape_profil est donné, tous les passages dans
+    cette étape sont exécutés sous le même cProfile et les statistiques
+    cumulées sont écrites dans fichier_profil (par défaut <etape>.prof)
+    par desactiver(). Si etape_memoire est donné, le pic
+    d'allocation de cette étape est mesuré avec tracemalloc.
+    """
+    global _actif, _etape_profil, _fichier_profil, _etape_memoire, _profil
+    _actif = True
+    _etape_profil = etape_profil
+    if etape_profil:
+        import cProfile
+        _profil = cProfile.Profile()
+    _fichier_profil = fichier_profil or (f"{etape_profil}.prof" if etape_profil else None)
+    _etape_memoire = etape_memoire
+
+
+def desactiver():
+    """
+    Écrit le profil cProfile s'il y en a un, puis désactive les mesures et
+    oublie les valeurs déjà relevées.
+    """
+    global _actif, _etape_profil, _fichier_profil, _etape_memoire, _profil
+    if _profil is not None:
+        _profil.dump_stats(_fichier_profil)
+    _actif = False
+    _etape_profil = _fichier_profil = _etape_memoire = _profil = None
+    _etapes.clear()
+    _compteurs.clear()
+    _memoire.clear()
+
+
+def est_actif():
+    return _actif
+
+
+def etape(nom):
+    """
+    Contexte chronométrant l'étape `nom`. Les durées de plusieurs passages
+    dans la même étape sont cumulées.
+    """
+    if not _actif:
+        return _CONTEXTE_VIDE
+    return _chronometrer(nom)
+
+
+@contextmanager
+def _chronometrer(nom):
+    profil = _profil if nom == _etape_profil else None
+    if profil:
+        _verrou_profil.acquire()
+    suivre_memoire = nom == _etape_memoire
+    if suivre_memoire:
+        import tracemalloc
+        tracemalloc.start()
+
+    debut = time.perf_counter()
+    if profil:
+        profil.enable()
+    try:
+        yield
+    finally:
+        if profil:
+            profil.disable()
+            _verrou_profil.release()
+        duree = time.perf_counter() - debut
+        if suivre_memoire:
+            _, pic = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        with _verrou:
+            total = _etapes.setdefault(nom, [0.0, 0])
+            total[0] += duree
+            total[1] += 1
+            if suivre_memoire:
+                _memoire[nom] = max(_memoire.get(nom, 0), pic)
+
+
+def compter(nom, n=1):
+    """
+    Ajoute n au compteur `nom`.
+    """
+    if _actif:
+        with _verrou:
+            _compteurs[nom] += n
+
+
+def en_dict():
+    """
+    Retourne les mesures relevées sous forme de dictionnaire sérialisable.
+    """
+    with _verrou:
+        return {
+            'etapes': {nom: {'secondes': round(duree, 6), 'appels': appels}
+                       for nom, (duree, appels) in _etapes.items()},
+            'compteurs': dict(_compteurs),
+            'memoire_pic_octets': dict(_memoire),
+        }
+
+
+def en_json():
+    return json.dumps(en_dict(), ensure_ascii=False, indent=2)
+
+
+def en_prometheus(prefixe='sae'):
+    """
+    Retourne les mesures au format texte Prometheus (collecteur textfile).
+    """
+    with _verrou:
+        etapes = {nom: tuple(valeurs) for nom, valeurs in _etapes.items()}
+        compteurs = dict(_compteurs)
+        memoire = dict(_memoire)
+
+    lignes = [
+        f"# HELP {prefixe}_etape_secondes Durée cumulée de chaque étape.",
+        f"# TYPE {prefixe}_etape_secondes gauge",
+    ]
+    for nom, (duree, _) in etapes.items():
+        lignes.append(f'{prefixe}_etape_secondes{{etape="{nom}"}} {duree:.6f}')
+    lignes += [
+        f"# HELP {prefixe}_etape_appels Nombre de passages dans chaque étape.",
+        f"# TYPE {prefixe}_etape_appels gauge",
+    ]
+    for nom, (_, appels) in etapes.items():
+        lignes.append(f'{prefixe}_etape_appels{{etape="{nom}"}} {appels}')
+    for nom, valeur in sorted(compteurs.items()):
+        lignes.append(f"# TYPE {prefixe}_{nom}_total counter")
+        lignes.append(f"{prefixe}_{nom}_total {valeur}")
+    if memoire:
+        lignes.append(f"# TYPE {prefixe}_memoire_pic_octets gauge")
+        for nom, pic in memoire.items():
+            lignes.append(f'{prefixe}_memoire_pic_octets{{etape="{nom}"}} {pic}')
+    return "\n".join(lignes) + "\n"
+
+
+def ecrire(format_sortie, nom_fichier=None):
+    """
+    Écrit les mesures au format 'json' ou 'prometheus' dans nom_fichier,
+    ou sur la sortie d'erreur si nom_fichier vaut None ou '-'. Le fichier
+    est remplacé atomiquement pour qu'un collecteur ne lise jamais un
+    fichier à moitié écrit.
+    """
+    contenu = en_prometheus() if format_sortie == 'prometheus' else en_json() + "\n"
+    if nom_fichier in (None, '-'):
+        sys.stderr.write(contenu)
+        return
+    temporaire = f"{nom_fichier}.{os.getpid()}.tmp"
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        f.write(contenu)
+    os.replace(temporaire, nom_fichier)
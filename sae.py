@@ -0,0 +1,735 @@
+"""
+Outil en ligne de commande regroupant les scripts V1 à V5 et l'analyse tcpdump.
+
+Sous-commandes :
+    convert  : conversion d'un fichier ICS en CSV (avec filtres optionnels)
+    stats    : nombre de séances par mois pour un groupe
+    chart    : graphique des séances par mois (matplotlib)
+    report   : rapport HTML tableau + diagramme (markdown, matplotlib)
+    netscan  : analyse d'une capture tcpdump (pandas, matplotlib)
+    history  : rapport et graphiques sur une période de l'historique des captures
+    serve    : service HTTP local interrogeant le calendrier en mémoire
+
+Les bibliothèques lourdes (pandas, matplotlib, markdown) ne sont importées
+qu'à l'intérieur des sous-commandes qui en ont besoin, afin que les tâches
+simples (convert, stats) démarrent rapidement.
+
+Exemples :
+    python sae.py convert ADE.ics --matiere 7 --groupe B1
+    python sae.py stats ADE.ics --groupe A1 --type TP
+    python sae.py netscan tcpdump.txt --sans-graphes --historique captures.db
+    python sae.py history captures.db --debut 2024-01-10 --fin 2024-01-17
+    python sae.py serve ADE.ics --port 8000
+    python sae.py --mesures prometheus --mesures-sortie sae.prom convert ADE.ics
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+from collections import Counter
+from datetime import date, datetime
+
+import mesures
+
+MOIS_NOMS = ['Janvier', 'Février', 'Mars', 'Avril', 'Mai', 'Juin',
+             'Juillet', 'Août', 'Septembre', 'Octobre', 'Novembre', 'Décembre']
+
+COLONNES_CSV = ['Résumé', 'Début', 'Fin', 'Lieu', 'Description']
+
+# Regex pour extraire les données réseau (heure, IP source/destination, flags TCP et taille des paquets)
+MOTIF_TCPDUMP = re.compile(r"(\d{2}:\d{2}:\d{2}\.\d+)\s+IP\s+(\S+)\s>\s(\S+):\sFlags\s+\[(\S+)\],.*length\s+(\d+)")
+
+SEUIL_DDOS = 100  # Seuil de connexions pour identifier une IP suspecte
+SEUIL_FLOOD = 50  # Seuil de paquets courts pour détecter un flood
+TAILLE_PAQUET_COURT = 50  # Taille en dessous de laquelle un paquet est considéré comme court
+
+# Étapes chronométrées, utilisables avec --profil et --memoire
+ETAPES = ['total', 'lecture_ics', 'filtrage', 'ecriture_csv', 'graphe', 'rendu_markdown',
+          'lecture_tcpdump', 'detection', 'rapport', 'historique', 'requete_historique']
+
+
+# ---------------------------------------------------------------------------
+# Calendrier ADE
+# ---------------------------------------------------------------------------
+
+def lire_fichier_ics(nom_fichier):
+    """
+    Lit le contenu du fichier .ics et extrait les données de tous les événements.
+    """
+    with open(nom_fichier, 'r', encoding='utf-8') as fichier:
+        lignes = fichier.readlines()
+
+    evenements = []
+    evenement = {}
+    dans_evenement = False
+    lignes_ignorees = 0
+
+    for ligne in lignes:
+        ligne = ligne.strip()
+        if ligne == 'BEGIN:VEVENT':
+            dans_evenement = True
+            evenement = {}
+        elif ligne == 'END:VEVENT':
+            dans_evenement = False
+            evenements.append(evenement)
+        elif dans_evenement:
+            if ligne.startswith('SUMMARY:'):
+                evenement['Résumé'] = ligne.split(':', 1)[1].strip()
+            elif ligne.startswith('DTSTART:'):
+                evenement['Début'] = formater_date(ligne.split(':', 1)[1].strip())
+            elif ligne.startswith('DTEND:'):
+                evenement['Fin'] = formater_date(ligne.split(':', 1)[1].strip())
+            elif ligne.startswith('LOCATION:'):
+                evenement['Lieu'] = ligne.split(':', 1)[1].strip()
+            elif ligne.startswith('DESCRIPTION:'):
+                evenement['Description'] = ligne.split(':', 1)[1].strip()
+            else:
+                lignes_ignorees += 1
+        else:
+            lignes_ignorees += 1
+
+    if mesures.est_actif():
+        mesures.compter('ics_octets_lus', os.path.getsize(nom_fichier))
+        mesures.compter('ics_lignes_lues', len(lignes))
+        mesures.compter('ics_lignes_ignorees', lignes_ignorees)
+        mesures.compter('ics_evenements', len(evenements))
+    return evenements
+
+
+def formater_date(date_ics):
+    """
+    Convertit une date au format ICS (YYYYMMDDTHHMMSSZ) en objet datetime.
+    """
+    try:
+        return datetime.strptime(date_ics, '%Y%m%dT%H%M%SZ')
+    except ValueError:
+        mesures.compter('ics_dates_invalides')
+        return None
+
+
+def filtrer_evenements(evenements, matiere=None, groupe=None, type_seance=None, salle=None):
+    """
+    Garde les événements dont le résumé contient la matière et le type de séance,
+    dont la description contient le groupe et dont le lieu contient la salle.
+    Un critère à None est ignoré.
+    """
+    return [
+        evenement for evenement in evenements
+        if (matiere is None or matiere in evenement.get('Résumé', ''))
+        and (type_seance is None or type_seance in evenement.get('Résumé', ''))
+        and (groupe is None or groupe in evenement.get('Description', ''))
+        and (salle is None or salle in evenement.get('Lieu', ''))
+    ]
+
+
+def ligne_csv(evenement):
+    """
+    Retourne la ligne CSV d'un événement, dans l'ordre de COLONNES_CSV.
+    """
+    return [
+        evenement.get('Résumé', ''),
+        evenement['Début'].strftime('%Y-%m-%d %H:%M') if evenement.get('Début') else '',
+        evenement['Fin'].strftime('%Y-%m-%d %H:%M') if evenement.get('Fin') else '',
+        evenement.get('Lieu', ''),
+        evenement.get('Description', '')
+    ]
+
+
+def convertir_en_csv(evenements, nom_fichier_csv):
+    """
+    Convertit les événements en fichier CSV.
+    """
+    with open(nom_fichier_csv, 'w', newline='', encoding='utf-8') as fichier_csv:
+        writer = csv.writer(fichier_csv)
+        writer.writerow(COLONNES_CSV)
+        writer.writerows(ligne_csv(evenement) for evenement in evenements)
+    mesures.compter('csv_lignes_ecrites', len(evenements))
+
+
+def compter_seances_par_mois(evenements):
+    """
+    Compte le nombre de séances par mois. Seuls les mois ayant au moins une
+    séance sont retournés, dans l'ordre du calendrier.
+    """
+    mois_counts = [0] * 12
+    for evenement in evenements:
+        date = evenement.get('Début')
+        if date:
+            mois_counts[date.month - 1] += 1
+
+    return {MOIS_NOMS[i]: mois_counts[i] for i in range(12) if mois_counts[i] > 0}
+
+
+def creer_graphe_barres(mois_counts, titre, nom_fichier_png):
+    """
+    Crée et exporte un histogramme des séances par mois.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(list(mois_counts.keys()), list(mois_counts.values()), color='skyblue', edgecolor='black')
+    plt.title(titre, fontsize=16)
+    plt.xlabel("Mois", fontsize=14)
+    plt.ylabel("Nombre de séances", fontsize=14)
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.savefig(nom_fichier_png, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def creer_graphe_camembert(mois_counts, titre, nom_fichier_png):
+    """
+    Crée et exporte un diagramme circulaire de la répartition des séances par mois.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(6, 6))
+    plt.pie(list(mois_counts.values()), labels=list(mois_counts.keys()), autopct='%1.1f%%',
+            startangle=140, colors=plt.cm.tab20.colors)
+    plt.title(titre)
+    plt.savefig(nom_fichier_png, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def generer_html(tableau_csv, titre_tableau, image_diagramme, titre_diagramme, fichier_html):
+    """
+    Génère un fichier HTML contenant un tableau et une image de diagramme circulaire.
+    """
+    import markdown
+
+    contenu_tableau = ""
+    if os.path.exists(tableau_csv):
+        with open(tableau_csv, 'r', newline='', encoding='utf-8') as f:
+            contenu_tableau += "<table border='1'>\n"
+            for i, colonnes in enumerate(csv.reader(f)):
+                if i == 0:
+                    contenu_tableau += "<thead><tr>" + "".join(f"<th>{col}</th>" for col in colonnes) + "</tr></thead>\n"
+                else:
+                    contenu_tableau += "<tr>" + "".join(f"<td>{col}</td>" for col in colonnes) + "</tr>\n"
+            contenu_tableau += "</table>\n"
+
+    contenu_markdown = f"""
+# Résultats des Travaux :
+
+## {titre_tableau} :
+{contenu_tableau}
+
+## {titre_diagramme} :
+
+![Diagramme Circulaire](./{os.path.basename(image_diagramme)})
+"""
+
+    with mesures.etape('rendu_markdown'):
+        html = markdown.markdown(contenu_markdown, extensions=['extra'])
+
+    html_complet = f"""
+<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Travaux Python</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        table {{ border-collapse: collapse; width: 100%; margin-top: 20px; }}
+        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+        th {{ background-color: #f2f2f2; }}
+    </style>
+</head>
+<body>
+    {html}
+</body>
+</html>
+"""
+
+    with open(fichier_html, 'w', encoding='utf-8') as f:
+        f.write(html_complet)
+
+
+# ---------------------------------------------------------------------------
+# Analyse réseau (tcpdump)
+# ---------------------------------------------------------------------------
+
+def lire_fichier_tcpdump(nom_fichier):
+    """
+    Lit les logs réseau et extrait l'heure, les IP source/destination,
+    les flags TCP et la taille de chaque paquet.
+    """
+    records = []
+    lignes_lues = 0
+    with open(nom_fichier, 'r', encoding='utf-8') as fichier:
+        for ligne in fichier:
+            lignes_lues += 1
+            match = MOTIF_TCPDUMP.search(ligne)
+            if match:
+                time, src_ip, dest_ip, flags, length = match.groups()
+                records.append({
+                    "Heure": time,
+                    "IP Source": src_ip,
+                    "IP Destination": dest_ip,
+                    "Flags": flags,
+                    "Longueur": int(length)
+                })
+
+    if mesures.est_actif():
+        mesures.compter('tcpdump_octets_lus', os.path.getsize(nom_fichier))
+        mesures.compter('tcpdump_lignes_lues', lignes_lues)
+        mesures.compter('tcpdump_paquets', len(records))
+        mesures.compter('tcpdump_regex_echecs', lignes_lues - len(records))
+    return records
+
+
+def ecrire_csv_tcpdump(records, nom_fichier_csv):
+    """
+    Sauvegarde les paquets analysés dans un fichier CSV.
+    """
+    with open(nom_fichier_csv, 'w', newline='', encoding='utf-8') as fichier_csv:
+        writer = csv.DictWriter(fichier_csv, fieldnames=["Heure", "IP Source", "IP Destination", "Flags", "Longueur"])
+        writer.writeheader()
+        writer.writerows(records)
+    mesures.compter('csv_lignes_ecrites', len(records))
+
+
+def detecter_menaces(df):
+    """
+    Détecte les DDoS possibles, les floods de paquets courts et résume les flags TCP.
+    Retourne les lignes du rapport et les comptages utilisés pour les graphiques.
+    """
+    suspicious_activity = []
+
+    # 1. DDoS : grand nombre de connexions provenant d'une même IP source
+    connections_per_source = df["IP Source"].value_counts()
+    suspicious_ips_ddos = connections_per_source[connections_per_source > SEUIL_DDOS].index.tolist()
+    if suspicious_ips_ddos:
+        suspicious_activity.append("**DDoS possible :** IP(s) source avec trop de connexions")
+        for ip in suspicious_ips_ddos:
+            suspicious_activity.append(f"- {ip} : {connections_per_source[ip]} connexions détectées")
+
+    # 2. Flood : grand nombre de paquets de petite taille
+    short_packets = df[df["Longueur"] < TAILLE_PAQUET_COURT]
+    short_packet_counts = short_packets["IP Source"].value_counts()
+    suspicious_ips_flood = short_packet_counts[short_packet_counts > SEUIL_FLOOD].index.tolist()
+    if suspicious_ips_flood:
+        suspicious_activity.append("**Flood possible :** IP(s) envoyant beaucoup de paquets courts")
+        for ip in suspicious_ips_flood:
+            suspicious_activity.append(f"- {ip} : {short_packet_counts[ip]} paquets courts détectés")
+
+    # 3. Anomalies TCP : occurrences de chaque flag
+    flag_counts = Counter(df["Flags"])
+    suspicious_activity.append("**Statistiques des flags TCP :**")
+    for flag, count in flag_counts.items():
+        suspicious_activity.append(f"- {flag} : {count} occurrences")
+
+    return suspicious_activity, connections_per_source, short_packet_counts
+
+
+def ecrire_rapport_reseau(df, suspicious_activity, connections_per_source, short_packet_counts, nom_fichier_md):
+    """
+    Génère le rapport Markdown des menaces détectées.
+    """
+    markdown_content = f"""
+# Rapport de Détection de Menaces Réseau
+
+## Résumé des Résultats
+- Nombre total de paquets analysés : **{len(df)}**
+- Nombre d'adresses IP sources uniques : **{df["IP Source"].nunique()}**
+- Nombre d'adresses IP destinations uniques : **{df["IP Destination"].nunique()}**
+
+## Menaces Potentielles Détectées
+{''.join([f"<br>{item}" for item in suspicious_activity])}
+
+## Statistiques Complètes
+### Connexions par IP Source (Top 10)
+{connections_per_source.head(10).to_markdown(index=False)}
+
+### Paquets Courts par IP Source (Top 10)
+{short_packet_counts.head(10).to_markdown(index=False)}
+"""
+
+    with open(nom_fichier_md, "w", encoding="utf-8") as file:
+        file.write(markdown_content)
+
+
+def ecrire_rapport_historique(resume, connexions, courts, flags, periode, nom_fichier_md):
+    """
+    Génère le rapport Markdown des menaces à partir des agrégats de l'historique.
+    """
+    suspicious_activity = []
+
+    suspicious_ips_ddos = [(ip, n) for ip, n in connexions if n > SEUIL_DDOS]
+    if suspicious_ips_ddos:
+        suspicious_activity.append("**DDoS possible :** IP(s) source avec trop de connexions")
+        for ip, n in suspicious_ips_ddos:
+            suspicious_activity.append(f"- {ip} : {n} connexions détectées")
+
+    suspicious_ips_flood = [(ip, n) for ip, n in courts if n > SEUIL_FLOOD]
+    if suspicious_ips_flood:
+        suspicious_activity.append("**Flood possible :** IP(s) envoyant beaucoup de paquets courts")
+        for ip, n in suspicious_ips_flood:
+            suspicious_activity.append(f"- {ip} : {n} paquets courts détectés")
+
+    suspicious_activity.append("**Statistiques des flags TCP :**")
+    for flag, count in flags:
+        suspicious_activity.append(f"- {flag} : {count} occurrences")
+
+    def tableau(lignes, colonne):
+        contenu = f"| IP Source | {colonne} |\n|:--|--:|\n"
+        return contenu + "".join(f"| {ip} | {n} |\n" for ip, n in lignes[:10])
+
+    markdown_content = f"""
+# Rapport de Détection de Menaces Réseau ({periode})
+
+## Résumé des Résultats
+- Nombre total de paquets analysés : **{resume['paquets']}**
+- Nombre d'adresses IP sources uniques : **{resume['sources']}**
+- Nombre d'adresses IP destinations uniques : **{resume['destinations']}**
+
+## Menaces Potentielles Détectées
+{''.join([f"<br>{item}" for item in suspicious_activity])}
+
+## Statistiques Complètes
+### Connexions par IP Source (Top 10)
+{tableau(connexions, "Connexions")}
+### Paquets Courts par IP Source (Top 10)
+{tableau(courts, "Paquets courts")}"""
+
+    with open(nom_fichier_md, "w", encoding="utf-8") as file:
+        file.write(markdown_content)
+
+
+def creer_graphes_historique(connexions, courts, par_minute, nom_fichier_png):
+    """
+    Crée les graphiques de l'historique : évolution du trafic par minute et
+    top 10 des connexions et paquets courts par IP source.
+    """
+    from historique import FORMAT_MINUTE
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 9))
+
+    plt.subplot(2, 1, 1)
+    plt.plot([datetime.strptime(m, FORMAT_MINUTE) for m, _, _ in par_minute],
+             [n for _, n, _ in par_minute], color='steelblue')
+    plt.title("Paquets par minute")
+    plt.ylabel("Nombre de Paquets")
+
+    plt.subplot(2, 2, 3)
+    plt.bar([ip for ip, _ in connexions[:10]], [n for _, n in connexions[:10]], color='skyblue')
+    plt.title("Top 10 des Connexions par IP Source")
+    plt.xticks(rotation=45, ha='right')
+
+    plt.subplot(2, 2, 4)
+    plt.bar([ip for ip, _ in courts[:10]], [n for _, n in courts[:10]], color='orange')
+    plt.title("Top 10 des Paquets Courts par IP Source")
+    plt.xticks(rotation=45, ha='right')
+
+    plt.tight_layout()
+    plt.savefig(nom_fichier_png)
+    plt.close()
+
+
+def creer_graphes_reseau(connections_per_source, short_packet_counts, nom_fichier_png):
+    """
+    Crée les graphiques des connexions et paquets courts par IP source.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 6))
+
+    plt.subplot(1, 2, 1)
+    connections_per_source.head(10).plot(kind="bar", color='skyblue', title="Top 10 des Connexions par IP Source",
+                                         xlabel="IP Source", ylabel="Nombre de Connexions")
+    plt.xticks(rotation=45, ha='right')
+
+    plt.subplot(1, 2, 2)
+    short_packet_counts.head(10).plot(kind="bar", color='orange', title="Top 10 des Paquets Courts par IP Source",
+                                      xlabel="IP Source", ylabel="Nombre de Paquets Courts")
+    plt.xticks(rotation=45, ha='right')
+
+    plt.tight_layout()
+    plt.savefig(nom_fichier_png)
+    plt.close()
+
+
+# ---------------------------------------------------------------------------
+# Sous-commandes
+# ---------------------------------------------------------------------------
+
+def verifier_fichier(nom_fichier):
+    """
+    Affiche un message d'erreur et retourne False si le fichier n'existe pas.
+    """
+    if not os.path.exists(nom_fichier):
+        print(f"Erreur : Le fichier '{nom_fichier}' n'existe pas.", file=sys.stderr)
+        return False
+    return True
+
+
+def lire_et_filtrer(args):
+    with mesures.etape('lecture_ics'):
+        evenements = lire_fichier_ics(args.ics)
+    with mesures.etape('filtrage'):
+        return filtrer_evenements(evenements, args.matiere, args.groupe, args.type, args.salle)
+
+
+def commande_convert(args):
+    evenements = lire_et_filtrer(args)
+    nom_fichier_csv = args.sortie or os.path.splitext(args.ics)[0] + '.csv'
+    with mesures.etape('ecriture_csv'):
+        convertir_en_csv(evenements, nom_fichier_csv)
+    print(f"Les données ont été converties et enregistrées dans {nom_fichier_csv}")
+    return 0
+
+
+def commande_stats(args):
+    evenements = lire_et_filtrer(args)
+    mois_counts = compter_seances_par_mois(evenements)
+    print("Nombre de séances par mois :")
+    for mois, count in mois_counts.items():
+        print(f"{mois} : {count} séances")
+    return 0
+
+
+def commande_chart(args):
+    evenements = lire_et_filtrer(args)
+    mois_counts = compter_seances_par_mois(evenements)
+    nom_fichier_png = args.sortie or os.path.splitext(args.ics)[0] + '_graphe.png'
+    titre = "Séances {}par mois".format(f"{args.type} " if args.type else "")
+    if args.groupe:
+        titre += f" (Groupe {args.groupe})"
+    with mesures.etape('graphe'):
+        if args.camembert:
+            creer_graphe_camembert(mois_counts, titre, nom_fichier_png)
+        else:
+            creer_graphe_barres(mois_counts, titre, nom_fichier_png)
+    print(f"Graphe exporté avec succès : {nom_fichier_png}")
+    return 0
+
+
+def commande_report(args):
+    with mesures.etape('lecture_ics'):
+        evenements = lire_fichier_ics(args.ics)
+    tableau_csv = os.path.join(args.dossier, "evenements_matiere{}_{}.csv".format(args.matiere, args.groupe_tableau.lower()))
+    image_diagramme = os.path.join(args.dossier, "evenements_{}.png".format(args.groupe_diagramme.lower()))
+    fichier_html = os.path.join(args.dossier, "resultats.html")
+
+    with mesures.etape('filtrage'):
+        evenements_tableau = filtrer_evenements(evenements, args.matiere, args.groupe_tableau)
+        evenements_diagramme = filtrer_evenements(evenements, groupe=args.groupe_diagramme)
+    with mesures.etape('ecriture_csv'):
+        convertir_en_csv(evenements_tableau, tableau_csv)
+    with mesures.etape('graphe'):
+        creer_graphe_camembert(compter_seances_par_mois(evenements_diagramme),
+                               f"Répartition des séances par mois (Groupe {args.groupe_diagramme})",
+                               image_diagramme)
+    generer_html(tableau_csv, f"Tableau des Séances (Matière {args.matiere}, Groupe {args.groupe_tableau})",
+                 image_diagramme, f"Diagramme Circulaire (Répartition par mois pour le groupe {args.groupe_diagramme})",
+                 fichier_html)
+    print(f"Fichier HTML généré : {fichier_html}")
+    return 0
+
+
+def commande_netscan(args):
+    print("Analyse du fichier tcpdump...")
+    with mesures.etape('lecture_tcpdump'):
+        records = lire_fichier_tcpdump(args.tcpdump)
+
+    print(f"Génération du fichier CSV : {args.csv}...")
+    with mesures.etape('ecriture_csv'):
+        ecrire_csv_tcpdump(records, args.csv)
+
+    if args.historique:
+        import historique
+
+        # tcpdump n'écrit pas la date : par défaut, la date de modification du fichier
+        # (fin de la capture) moins le nombre de minuits traversés
+        date_capture = args.date or historique.date_debut_capture(
+            date.fromtimestamp(os.path.getmtime(args.tcpdump)), records)
+        with mesures.etape('historique'):
+            connexion = historique.ouvrir(args.historique)
+            try:
+                capture_id = historique.importer_capture(connexion, args.tcpdump, records, date_capture,
+                                                         TAILLE_PAQUET_COURT)
+            finally:
+                connexion.close()
+        if capture_id is None:
+            print(f"Capture déjà présente dans l'historique : {args.historique}")
+        else:
+            print(f"Capture ajoutée à l'historique : {args.historique}")
+
+    print("Détection de menaces potentielles...")
+    with mesures.etape('detection'):
+        import pandas as pd
+        df = pd.DataFrame(records, columns=["Heure", "IP Source", "IP Destination", "Flags", "Longueur"])
+        suspicious_activity, connections_per_source, short_packet_counts = detecter_menaces(df)
+
+    print(f"Génération du rapport Markdown : {args.rapport}...")
+    with mesures.etape('rapport'):
+        ecrire_rapport_reseau(df, suspicious_activity, connections_per_source, short_packet_counts, args.rapport)
+
+    if not args.sans_graphes:
+        print(f"Génération des graphiques : {args.graphes}...")
+        with mesures.etape('graphe'):
+            creer_graphes_reseau(connections_per_source, short_packet_counts, args.graphes)
+
+    return 0
+
+
+def commande_history(args):
+    debut = args.debut.isoformat() if args.debut else None
+    fin = args.fin.isoformat() if args.fin else None
+    periode = f"{debut or 'début'} → {fin or 'fin'}"
+
+    import historique
+
+    connexion = historique.ouvrir(args.base)
+    try:
+        with mesures.etape('requete_historique'):
+            resume = historique.resume(connexion, debut, fin, args.hote)
+            connexions = historique.paquets_par_source(connexion, debut, fin, args.hote)
+            courts = historique.paquets_par_source(connexion, debut, fin, args.hote, courts=True)
+            flags = historique.paquets_par_flags(connexion, debut, fin, args.hote)
+            par_minute = historique.paquets_par_minute(connexion, debut, fin, args.hote)
+    finally:
+        connexion.close()
+
+    print(f"Génération du rapport Markdown : {args.rapport}...")
+    with mesures.etape('rapport'):
+        ecrire_rapport_historique(resume, connexions, courts, flags, periode, args.rapport)
+
+    if not args.sans_graphes:
+        print(f"Génération des graphiques : {args.graphes}...")
+        with mesures.etape('graphe'):
+            creer_graphes_historique(connexions, courts, par_minute, args.graphes)
+    return 0
+
+
+def commande_serve(args):
+    import service_calendrier
+
+    serveur = service_calendrier.creer_serveur(args.ics, args.hote, args.port, args.cache)
+    hote, port = serveur.server_address[:2]
+    print(f"Calendrier servi sur http://{hote}:{port}/evenements")
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serveur.server_close()
+    return 0
+
+
+def ajouter_filtres(parser):
+    parser.add_argument('--matiere', help="texte recherché dans le résumé (ex : 7, R1.03)")
+    parser.add_argument('--groupe', help="texte recherché dans la description (ex : A1, B1)")
+    parser.add_argument('--type', help="type de séance recherché dans le résumé (ex : TP, TD)")
+    parser.add_argument('--salle', help="texte recherché dans le lieu (ex : G_019)")
+
+
+def construire_parser():
+    parser = argparse.ArgumentParser(prog='sae', description="Outils d'analyse du calendrier ADE et des captures tcpdump.")
+    parser.add_argument('--mesures', choices=['json', 'prometheus'],
+                        help="active les mesures de durée et les compteurs dans ce format")
+    parser.add_argument('--mesures-sortie', default='-', metavar='FICHIER',
+                        help="fichier des mesures (par défaut : sortie d'erreur)")
+    parser.add_argument('--profil', metavar='ETAPE', choices=ETAPES, help="exécute cette étape sous cProfile (tous les passages sont cumulés)")
+    parser.add_argument('--profil-sortie', metavar='FICHIER', help="fichier cProfile (par défaut : <ETAPE>.prof)")
+    parser.add_argument('--memoire', metavar='ETAPE', choices=ETAPES,
+                        help="mesure le pic mémoire de cette étape (tracemalloc)")
+    sous_commandes = parser.add_subparsers(dest='commande', required=True)
+
+    p = sous_commandes.add_parser('convert', help="convertit un fichier ICS en CSV")
+    p.add_argument('ics')
+    p.add_argument('-o', '--sortie', help="fichier CSV de sortie (par défaut : <ics>.csv)")
+    ajouter_filtres(p)
+    p.set_defaults(fonction=commande_convert)
+
+    p = sous_commandes.add_parser('stats', help="affiche le nombre de séances par mois")
+    p.add_argument('ics')
+    ajouter_filtres(p)
+    p.set_defaults(fonction=commande_stats)
+
+    p = sous_commandes.add_parser('chart', help="exporte un graphique des séances par mois")
+    p.add_argument('ics')
+    p.add_argument('-o', '--sortie', help="fichier PNG de sortie (par défaut : <ics>_graphe.png)")
+    p.add_argument('--camembert', action='store_true', help="diagramme circulaire au lieu d'un histogramme")
+    ajouter_filtres(p)
+    p.set_defaults(fonction=commande_chart)
+
+    p = sous_commandes.add_parser('report', help="génère le rapport HTML (tableau + diagramme)")
+    p.add_argument('ics')
+    p.add_argument('--matiere', default='7')
+    p.add_argument('--groupe-tableau', default='B1')
+    p.add_argument('--groupe-diagramme', default='A1')
+    p.add_argument('--dossier', default='.', help="dossier de sortie")
+    p.set_defaults(fonction=commande_report)
+
+    p = sous_commandes.add_parser('netscan', help="analyse une capture tcpdump")
+    p.add_argument('tcpdump', nargs='?', default='tcpdump.txt')
+    p.add_argument('--csv', default='network_traffic.csv')
+    p.add_argument('--rapport', default='suspicious_activity_report.md')
+    p.add_argument('--graphes', default='network_traffic_graphs.png')
+    p.add_argument('--sans-graphes', action='store_true', help="ne génère pas les graphiques (évite matplotlib)")
+    p.add_argument('--historique', metavar='BASE', help="ajoute la capture à cette base d'historique SQLite")
+    p.add_argument('--date', type=date.fromisoformat,
+                   help="jour où la capture a commencé, AAAA-MM-JJ (par défaut : date de modification du "
+                        "fichier, c'est-à-dire de fin de capture, moins les minuits traversés)")
+    p.set_defaults(fonction=commande_netscan)
+
+    p = sous_commandes.add_parser('history', help="rapport sur une période de l'historique des captures")
+    p.add_argument('base')
+    p.add_argument('--debut', type=date.fromisoformat, help="premier jour inclus, AAAA-MM-JJ")
+    p.add_argument('--fin', type=date.fromisoformat, help="jour exclu, AAAA-MM-JJ")
+    p.add_argument('--hote', help="ne garde que le trafic de ou vers cet hôte (adresse sans le port)")
+    p.add_argument('--rapport', default='historique_report.md')
+    p.add_argument('--graphes', default='historique_graphs.png')
+    p.add_argument('--sans-graphes', action='store_true', help="ne génère pas les graphiques (évite matplotlib)")
+    p.set_defaults(fonction=commande_history)
+
+    p = sous_commandes.add_parser('serve', help="sert le calendrier en JSON ou CSV sur HTTP")
+    p.add_argument('ics')
+    p.add_argument('--hote', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8000)
+    p.add_argument('--cache', type=int, default=128, help="nombre de réponses gardées en cache")
+    p.set_defaults(fonction=commande_serve)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Fonction principale : analyse les arguments et lance la sous-commande.
+    """
+    args = construire_parser().parse_args(argv)
+    fichier = getattr(args, 'ics', None) or getattr(args, 'tcpdump', None) or getattr(args, 'base', None)
+    if fichier and not verifier_fichier(fichier):
+        return 1
+
+    if not (args.mesures or args.profil or args.memoire):
+        return args.fonction(args)
+
+    mesures.activer(args.profil, args.profil_sortie, args.memoire)
+    try:
+        with mesures.etape('total'):
+            code = args.fonction(args)
+        if args.mesures:
+            mesures.ecrire(args.mesures, args.mesures_sortie)
+        elif args.memoire:
+            pic = mesures.en_dict()['memoire_pic_octets'].get(args.memoire)
+            if pic is not None:
+                print(f"Pic mémoire de l'étape {args.memoire} : {pic} octets", file=sys.stderr)
+    finally:
+        mesures.desactiver()
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""
+Service HTTP local, en lecture seule, sur le calendrier ADE.
+
+Le fichier ICS est lu une seule fois puis gardé en mémoire, trié par date de
+début. Il est relu automatiquement quand sa date de modification ou sa taille
+change. Les réponses déjà rendues sont gardées dans un cache LRU et portent
+un ETag : un client qui renvoie If-None-Match reçoit 304 sans corps.
+
+Requête :
+    GET /evenements?groupe=B1&matiere=R1.03&salle=G_019&debut=2023-10-01&fin=2023-11-01&format=csv
+
+debut est inclus, fin est exclue (dates AAAA-MM-JJ). format vaut json
+(par défaut) ou csv.
+
+Exemple :
+    python sae.py serve ADE.ics --port 8000
+"""
+import bisect
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import mesures
+import sae
+
+FILTRES = ('groupe', 'matiere', 'salle', 'debut', 'fin', 'format')
+TYPES_CONTENU = {
+    'json': 'application/json; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class Calendrier:
+    """
+    Événements du fichier ICS gardés en mémoire et relus quand le fichier change.
+
+    L'attribut etat est un instantané (version, evenements, debuts) remplacé
+    d'un seul coup à chaque rechargement : un lecteur qui le lit une fois
+    travaille sur une version cohérente du calendrier. Il vaut None tant
+    qu'aucune lecture n'a réussi.
+    """
+
+    def __init__(self, nom_fichier):
+        self.nom_fichier = nom_fichier
+        self.signature = None
+        self.etat = None
+        self._verrou = threading.Lock()
+        self.actualiser()
+
+    def actualiser(self):
+        """
+        Relit le fichier si sa signature (date de modification, taille) a changé.
+        Retourne True si le calendrier a été rechargé. Si le fichier est absent
+        ou illisible (par exemple pendant son remplacement), le dernier
+        calendrier lu reste servi ; un fichier illisible n'est relu qu'après
+        avoir changé de nouveau.
+        """
+        try:
+            stat = os.stat(self.nom_fichier)
+        except OSError:
+            return False
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self.signature:
+            return False
+
+        with self._verrou:
+            # Un autre thread a pu recharger pendant l'attente du verrou
+            if signature == self.signature:
+                return False
+            try:
+                with mesures.etape('lecture_ics'):
+                    evenements = sae.lire_fichier_ics(self.nom_fichier)
+            except (OSError, ValueError):
+                self.signature = signature
+                return False
+            # Les événements sans date sont placés en tête (datetime.min) ;
+            # rechercher() les écarte dès qu'une borne de date est donnée
+            evenements.sort(key=lambda e: e.get('Début') or datetime.min)
+            version = self.etat[0] + 1 if self.etat else 1
+            self.etat = (version, evenements, [e.get('Début') or datetime.min for e in evenements])
+            self.signature = signature
+        return True
+
+
+def rechercher(etat, groupe=None, matiere=None, salle=None, debut=None, fin=None):
+    """
+    Retourne les événements de l'instantané etat correspondant aux filtres,
+    triés par date de début.
+    """
+    _, evenements, debuts = etat
+    gauche, droite = 0, len(evenements)
+    if debut or fin:
+        # Saute les événements sans date, rangés en tête
+        gauche = bisect.bisect_right(debuts, datetime.min)
+    if debut:
+        gauche = max(gauche, bisect.bisect_left(debuts, datetime.combine(debut, datetime.min.time())))
+    if fin:
+        droite = bisect.bisect_left(debuts, datetime.combine(fin, datetime.min.time()))
+    return sae.filtrer_evenements(evenements[gauche:droite], matiere=matiere, groupe=groupe, salle=salle)
+
+
+class CacheLRU:
+    """
+    Cache LRU des réponses rendues, partagé entre les threads du serveur.
+    """
+
+    def __init__(self, capacite=128):
+        self.capacite = capacite
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def lire(self, cle):
+        with self._verrou:
+            valeur = self._entrees.get(cle)
+            if valeur is not None:
+                self._entrees.move_to_end(cle)
+            return valeur
+
+    def ecrire(self, cle, valeur):
+        with self._verrou:
+            self._entrees[cle] = valeur
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.capacite:
+                self._entrees.popitem(last=False)
+
+
+def evenement_en_json(evenement):
+    return {
+        'resume': evenement.get('Résumé', ''),
+        'debut': evenement['Début'].isoformat() if evenement.get('Début') else None,
+        'fin': evenement['Fin'].isoformat() if evenement.get('Fin') else None,
+        'lieu': evenement.get('Lieu', ''),
+        'description': evenement.get('Description', ''),
+    }
+
+
+def rendre(evenements, format_sortie):
+    """
+    Rend la liste d'événements en JSON ou en CSV (mêmes colonnes que sae.py convert).
+    """
+    if format_sortie == 'csv':
+        tampon = io.StringIO()
+        writer = csv.writer(tampon)
+        writer.writerow(sae.COLONNES_CSV)
+        writer.writerows(sae.ligne_csv(evenement) for evenement in evenements)
+        return tampon.getvalue().encode('utf-8')
+    return json.dumps([evenement_en_json(e) for e in evenements], ensure_ascii=False).encode('utf-8')
+
+
+def etag_correspond(if_none_match, etag):
+    """
+    Indique si l'en-tête If-None-Match désigne etag. La comparaison est
+    faible (un préfixe W/ est ignoré) et '*' correspond à toute réponse.
+    """
+    for valeur in if_none_match.split(','):
+        valeur = valeur.strip()
+        if valeur == '*' or valeur.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+def lire_filtres(requete):
+    """
+    Extrait et valide les filtres de la chaîne de requête. Lève ValueError
+    si un paramètre est inconnu ou mal formé.
+    """
+    parametres = parse_qs(requete)
+    inconnus = set(parametres) - set(FILTRES)
+    if inconnus:
+        raise ValueError(f"Paramètre(s) inconnu(s) : {', '.join(sorted(inconnus))}")
+
+    filtres = {nom: valeurs[-1] for nom, valeurs in parametres.items()}
+    format_sortie = filtres.pop('format', 'json')
+    if format_sortie not in TYPES_CONTENU:
+        raise ValueError(f"Format inconnu : {format_sortie}")
+    for nom in ('debut', 'fin'):
+        if nom in filtres:
+            filtres[nom] = date.fromisoformat(filtres[nom])
+    return filtres, format_sortie
+
+
+class GestionnaireCalendrier(BaseHTTPRequestHandler):
+    """
+    Répond aux requêtes GET /evenements à partir du calendrier en mémoire.
+    Les attributs calendrier et cache sont fournis par creer_serveur().
+    """
+    calendrier = None
+    cache = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != '/evenements':
+            self.envoyer_erreur(404, "Ressource inconnue")
+            return
+        try:
+            filtres, format_sortie = lire_filtres(url.query)
+        except ValueError as erreur:
+            self.envoyer_erreur(400, str(erreur))
+            return
+
+        self.calendrier.actualiser()
+        etat = self.calendrier.etat
+        if etat is None:
+            self.envoyer_erreur(503, "Calendrier indisponible")
+            return
+
+        cle = (etat[0], format_sortie, tuple(sorted(filtres.items())))
+        reponse = self.cache.lire(cle)
+        if reponse is None:
+            mesures.compter('service_cache_echecs')
+            corps = rendre(rechercher(etat, **filtres), format_sortie)
+            reponse = (corps, '"' + hashlib.sha1(corps).hexdigest() + '"')
+            self.cache.ecrire(cle, reponse)
+        corps, etag = reponse
+
+        if etag_correspond(self.headers.get('If-None-Match', ''), etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', TYPES_CONTENU[format_sortie])
+        self.send_header('Content-Length', str(len(corps)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def envoyer_erreur(self, code, message):
+        corps = json.dumps({'erreur': message}, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', TYPES_CONTENU['json'])
+        self.send_header('Content-Length', str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, format, *args):
+        # Pas de journal par requête : le service est interrogé en boucle par les outils internes
+        pass
+
+
+def creer_serveur(nom_fichier_ics, hote='127.0.0.1', port=8000, taille_cache=128):
+    """
+    Charge le calendrier et retourne un serveur HTTP multi-thread prêt à
+    être lancé avec serve_forever(). Avec port=0, un port libre est choisi
+    (voir serveur.server_address).
+    """
+    gestionnaire = type('Gestionnaire', (GestionnaireCalendrier,), {
+        'calendrier': Calendrier(nom_fichier_ics),
+        'cache': CacheLRU(taille_cache),
+    })
+    serveur = ThreadingHTTPServer((hote, port), gestionnaire)
+    serveur.daemon_threads = True
+    return serveur
@@ -0,0 +1,45 @@
+"""
+Budget de démarrage de sae.py : les bibliothèques lourdes (et l'historique SQLite)
+ne doivent être chargées ni à l'import ni par les sous-commandes simples.
+"""
+import os
+import subprocess
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES_LOURDS = ('pandas', 'matplotlib', 'markdown', 'historique', 'sqlite3')
+BUDGET_IMPORT_US = 100_000  # 100 ms cumulées pour `import sae`
+
+
+def executer(code):
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=RACINE,
+                          capture_output=True, text=True, check=True)
+
+
+def temps_import_cumule(sortie_importtime, module):
+    """
+    Retourne le temps d'import cumulé (µs) du module dans la sortie de -X importtime.
+    """
+    for ligne in sortie_importtime.splitlines():
+        colonnes = ligne.split('|')
+        if len(colonnes) == 3 and colonnes[2].strip() == module:
+            return int(colonnes[1])
+    raise AssertionError(f"{module} absent de la sortie -X importtime")
+
+
+def test_import_sae_dans_le_budget():
+    resultat = executer("import sys, sae; print(sorted(m for m in sys.modules if m.split('.')[0] in %r))"
+                        % (MODULES_LOURDS,))
+    assert resultat.stdout.strip() == '[]'
+    assert temps_import_cumule(resultat.stderr, 'sae') < BUDGET_IMPORT_US
+
+
+def test_convert_sans_modules_lourds(tmp_path):
+    sortie = tmp_path / 'ade.csv'
+    resultat = executer(
+        "import sys, sae\n"
+        f"assert sae.main(['convert', 'ADE.ics', '-o', {str(sortie)!r}]) == 0\n"
+        f"print(sorted(m for m in sys.modules if m.split('.')[0] in {MODULES_LOURDS!r}))"
+    )
+    assert resultat.stdout.strip().splitlines()[-1] == '[]'
+    assert sortie.read_text(encoding='utf-8').startswith('Résumé,Début,Fin,Lieu,Description')
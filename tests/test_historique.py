@@ -0,0 +1,93 @@
+import sqlite3
+import sys
+import threading
+from datetime import date
+
+import pytest
+
+import historique
+import sae
+
+CAPTURE = """\
+23:58:10.100000 IP 10.0.0.1.54321 > 10.0.0.9.https: Flags [S], seq 1, win 64240, length 0
+23:58:10.200000 IP 10.0.0.1.54322 > 10.0.0.9.https: Flags [S], seq 7, win 64240, length 0
+23:59:59.100000 IP 10.0.0.1.54321 > 10.0.0.9.https: Flags [P.], seq 1:121, ack 1, win 502, length 120
+00:00:01.500000 IP 10.0.0.3.40000 > 10.0.0.9.22: Flags [S], seq 1, win 64240, length 10
+"""
+
+
+def capture(tmp_path):
+    fichier = tmp_path / 'capture.txt'
+    fichier.write_text(CAPTURE, encoding='utf-8')
+    return str(fichier), sae.lire_fichier_tcpdump(str(fichier))
+
+
+def test_date_debut_depuis_la_fin_de_capture(tmp_path):
+    _, records = capture(tmp_path)
+    assert historique.passages_minuit(records) == 1
+    assert historique.date_debut_capture(date(2024, 1, 11), records) == date(2024, 1, 10)
+
+
+def test_agregats_par_minute_et_passage_minuit(tmp_path):
+    nom_fichier, records = capture(tmp_path)
+    connexion = historique.ouvrir(str(tmp_path / 'h.db'))
+    assert historique.importer_capture(connexion, nom_fichier, records, date(2024, 1, 10), 50) is not None
+
+    assert historique.paquets_par_minute(connexion) == [
+        ('2024-01-10 23:58', 2, 0), ('2024-01-10 23:59', 1, 120), ('2024-01-11 00:00', 1, 10)]
+    assert historique.paquets_par_source(connexion, debut='2024-01-11') == [('10.0.0.3', 1)]
+    assert historique.paquets_par_source(connexion, courts=True) == [('10.0.0.1', 2), ('10.0.0.3', 1)]
+
+
+def test_agregats_par_hote_sans_port_source(tmp_path):
+    nom_fichier, records = capture(tmp_path)
+    connexion = historique.ouvrir(str(tmp_path / 'h.db'))
+    historique.importer_capture(connexion, nom_fichier, records, date(2024, 1, 10), 50)
+
+    # Les deux SYN depuis des ports éphémères différents tombent dans la même ligne
+    assert connexion.execute(
+        "SELECT source, destination, port_destination, flags, paquets FROM agregats WHERE minute = '2024-01-10 23:58'"
+    ).fetchall() == [('10.0.0.1', '10.0.0.9', 'https', 'S', 2)]
+    assert historique.resume(connexion, hote='10.0.0.1') == {'paquets': 3, 'sources': 1, 'destinations': 1}
+    assert historique.resume(connexion, hote='10.0.0.9')['paquets'] == 4
+
+
+def test_separer_port():
+    assert historique.separer_port('10.0.0.1.54321') == ('10.0.0.1', '54321')
+    assert historique.separer_port('par10s38-in-f3.1e100.net.https') == ('par10s38-in-f3.1e100.net', 'https')
+    assert historique.separer_port('fe80::1.443') == ('fe80::1', '443')
+
+
+def test_capture_importee_une_seule_fois(tmp_path):
+    nom_fichier, records = capture(tmp_path)
+    base = str(tmp_path / 'h.db')
+    historique.ouvrir(base).close()
+    resultats = []
+
+    def importer():
+        connexion = sqlite3.connect(base, timeout=10)
+        try:
+            resultats.append(historique.importer_capture(connexion, nom_fichier, records, date(2024, 1, 10), 50))
+        finally:
+            connexion.close()
+
+    threads = [threading.Thread(target=importer) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(r is not None for r in resultats) == 1
+    connexion = historique.ouvrir(base)
+    assert historique.resume(connexion)['paquets'] == 4
+
+
+def test_netscan_importe_avant_l_analyse_pandas(tmp_path, monkeypatch):
+    nom_fichier, _ = capture(tmp_path)
+    base = str(tmp_path / 'h.db')
+    # L'analyse (pandas) échoue : la capture doit déjà être dans l'historique
+    monkeypatch.setitem(sys.modules, 'pandas', None)
+    with pytest.raises(ImportError):
+        sae.main(['netscan', nom_fichier, '--csv', str(tmp_path / 'c.csv'), '--historique', base,
+                  '--date', '2024-01-10', '--sans-graphes'])
+    assert historique.resume(historique.ouvrir(base))['paquets'] == 4
@@ -0,0 +1,105 @@
+import os
+import pstats
+import threading
+import time
+
+import pytest
+
+import mesures
+import sae
+
+TEST_ICS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test.ics')
+
+
+@pytest.fixture(autouse=True)
+def mesures_reinitialisees():
+    mesures.desactiver()
+    yield
+    mesures.desactiver()
+
+
+def test_desactive_ne_mesure_rien():
+    with mesures.etape('lecture_ics'):
+        mesures.compter('ics_evenements', 3)
+    assert mesures.etape('autre') is mesures.etape('lecture_ics')
+    assert mesures.en_dict() == {'etapes': {}, 'compteurs': {}, 'memoire_pic_octets': {}}
+
+
+def test_durees_et_compteurs_cumules():
+    mesures.activer()
+    for _ in range(2):
+        with mesures.etape('lecture_ics'):
+            time.sleep(0.01)
+        mesures.compter('ics_evenements', 5)
+
+    resultat = mesures.en_dict()
+    assert resultat['etapes']['lecture_ics']['appels'] == 2
+    assert resultat['etapes']['lecture_ics']['secondes'] >= 0.02
+    assert resultat['compteurs'] == {'ics_evenements': 10}
+
+
+def test_format_prometheus():
+    mesures.activer()
+    with mesures.etape('filtrage'):
+        pass
+    mesures.compter('csv_lignes_ecrites', 7)
+
+    lignes = mesures.en_prometheus().splitlines()
+    assert "# TYPE sae_etape_secondes gauge" in lignes
+    assert any(ligne.startswith('sae_etape_secondes{etape="filtrage"} ') for ligne in lignes)
+    assert 'sae_etape_appels{etape="filtrage"} 1' in lignes
+    assert "# TYPE sae_csv_lignes_ecrites_total counter" in lignes
+    assert "sae_csv_lignes_ecrites_total 7" in lignes
+
+
+def test_pic_memoire_sur_une_etape():
+    mesures.activer(etape_memoire='lecture_ics')
+    with mesures.etape('lecture_ics'):
+        donnees = [0] * 100_000
+    del donnees
+    assert mesures.en_dict()['memoire_pic_octets']['lecture_ics'] > 100_000
+
+
+def test_profil_seul_n_ecrit_pas_les_mesures(tmp_path, capsys):
+    fichier_profil = tmp_path / 'lecture.prof'
+    assert sae.main(['--profil', 'lecture_ics', '--profil-sortie', str(fichier_profil), 'stats', TEST_ICS]) == 0
+    assert fichier_profil.exists()
+    assert capsys.readouterr().err == ''
+
+
+def test_etape_inconnue_refusee():
+    with pytest.raises(SystemExit):
+        sae.main(['--profil', 'inexistante', 'stats', TEST_ICS])
+
+
+def test_compteurs_depuis_plusieurs_threads():
+    mesures.activer()
+
+    def travailler():
+        for _ in range(10_000):
+            mesures.compter('service_cache_echecs')
+            with mesures.etape('filtrage'):
+                pass
+
+    threads = [threading.Thread(target=travailler) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    resultat = mesures.en_dict()
+    assert resultat['compteurs']['service_cache_echecs'] == 80_000
+    assert resultat['etapes']['filtrage']['appels'] == 80_000
+
+
+def test_profil_cumule_sur_tous_les_passages(tmp_path):
+    fichier_profil = tmp_path / 'filtrage.prof'
+    mesures.activer(etape_profil='filtrage', fichier_profil=str(fichier_profil))
+    for _ in range(3):
+        with mesures.etape('filtrage'):
+            sae.filtrer_evenements([], groupe='A1')
+    mesures.desactiver()
+
+    statistiques = pstats.Stats(str(fichier_profil)).stats
+    appels = [valeurs[0] for (_, _, fonction), valeurs in statistiques.items() if fonction == 'filtrer_evenements']
+    assert appels == [3]
@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+import service_calendrier
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def fichier_ics(tmp_path):
+    chemin = tmp_path / 'ADE.ics'
+    shutil.copy(os.path.join(RACINE, 'ADE.ics'), chemin)
+    return chemin
+
+
+@pytest.fixture
+def serveur(fichier_ics):
+    serveur = service_calendrier.creer_serveur(str(fichier_ics), port=0)
+    thread = threading.Thread(target=serveur.serve_forever, daemon=True)
+    thread.start()
+    yield serveur
+    serveur.shutdown()
+    serveur.server_close()
+
+
+def requete(serveur, requete='', entetes=None):
+    """
+    Envoie GET /evenements?requete et retourne (code, entêtes, corps).
+    """
+    url = f"http://127.0.0.1:{serveur.server_address[1]}/evenements?{requete}"
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=entetes or {})) as reponse:
+            return reponse.status, reponse.headers, reponse.read()
+    except urllib.error.HTTPError as erreur:
+        return erreur.code, erreur.headers, erreur.read()
+
+
+def calendrier(serveur):
+    return serveur.RequestHandlerClass.calendrier
+
+
+def test_json(serveur):
+    code, entetes, corps = requete(serveur, 'groupe=B1')
+    assert code == 200
+    assert entetes['Content-Type'].startswith('application/json')
+    evenements = json.loads(corps)
+    assert evenements and all('B1' in e['description'] for e in evenements)
+
+
+def test_csv(serveur):
+    code, entetes, corps = requete(serveur, 'groupe=B1&salle=G_019&format=csv')
+    assert code == 200
+    assert entetes['Content-Type'].startswith('text/csv')
+    lignes = list(csv.reader(io.StringIO(corps.decode('utf-8'))))
+    assert lignes[0] == ['Résumé', 'Début', 'Fin', 'Lieu', 'Description']
+    assert len(lignes) > 1 and all('G_019' in ligne[3] for ligne in lignes[1:])
+
+
+def test_etag_et_if_none_match(serveur):
+    _, entetes, _ = requete(serveur, 'groupe=A1')
+    code, entetes_304, corps = requete(serveur, 'groupe=A1', {'If-None-Match': entetes['ETag']})
+    assert code == 304
+    assert entetes_304['ETag'] == entetes['ETag']
+    assert corps == b''
+
+
+@pytest.mark.parametrize('parametres', ['inconnu=1', 'debut=2023-13-45', 'format=xml'])
+def test_requete_invalide(serveur, parametres):
+    code, _, corps = requete(serveur, parametres)
+    assert code == 400
+    assert 'erreur' in json.loads(corps)
+
+
+def test_filtre_par_periode(serveur):
+    _, _, corps = requete(serveur, 'debut=2023-11-01&fin=2023-12-01')
+    evenements = json.loads(corps)
+    assert evenements
+    assert all('2023-11-01' <= e['debut'] < '2023-12-01' for e in evenements)
+    assert [e['debut'] for e in evenements] == sorted(e['debut'] for e in evenements)
+
+
+def test_rechargement_a_chaud(serveur, fichier_ics):
+    assert len(json.loads(requete(serveur)[2])) == 694
+    shutil.copy(os.path.join(RACINE, 'test.ics'), fichier_ics)
+    evenements = json.loads(requete(serveur)[2])
+    assert [e['resume'] for e in evenements] == ['SAE1.05']
+    assert calendrier(serveur).etat[0] == 2
+
+
+def test_requetes_concurrentes_une_seule_lecture(serveur, fichier_ics):
+    shutil.copy(os.path.join(RACINE, 'test.ics'), fichier_ics)
+    with ThreadPoolExecutor(16) as executeur:
+        codes = list(executeur.map(lambda _: requete(serveur, 'groupe=S1')[0], range(64)))
+    assert codes == [200] * 64
+    assert calendrier(serveur).etat[0] == 2
+
+
+def test_fichier_absent_garde_le_dernier_calendrier(serveur, fichier_ics):
+    os.rename(fichier_ics, str(fichier_ics) + '.tmp')
+    code, _, corps = requete(serveur, 'groupe=B1')
+    assert code == 200 and json.loads(corps)
+
+
+def test_503_sans_calendrier(tmp_path):
+    serveur = service_calendrier.creer_serveur(str(tmp_path / 'absent.ics'), port=0)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    try:
+        code, _, corps = requete(serveur)
+        assert code == 503
+        assert 'erreur' in json.loads(corps)
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
+
+
+@pytest.mark.parametrize('if_none_match', ['W/{etag}', '"autre", {etag}', '*'])
+def test_if_none_match_faible_et_joker(serveur, if_none_match):
+    _, entetes, _ = requete(serveur, 'groupe=A2')
+    code, _, _ = requete(serveur, 'groupe=A2', {'If-None-Match': if_none_match.format(etag=entetes['ETag'])})
+    assert code == 304
+
+
+def test_evenement_sans_date_exclu_des_filtres_par_date(tmp_path):
+    contenu = open(os.path.join(RACINE, 'test.ics'), encoding='utf-8').read()
+    sans_date = contenu.replace('DTSTART:20240110T080000Z', 'DTSTART:invalide').replace('SAE1.05', 'SANS DATE')
+    fichier = tmp_path / 'cal.ics'
+    fichier.write_text(contenu + '\n' + sans_date, encoding='utf-8')
+    etat = service_calendrier.Calendrier(str(fichier)).etat
+
+    assert len(service_calendrier.rechercher(etat)) == 2
+    assert [e['Résumé'] for e in service_calendrier.rechercher(etat, fin=date(2025, 1, 1))] == ['SAE1.05']
+    assert [e['Résumé'] for e in service_calendrier.rechercher(etat, debut=date(2024, 1, 1))] == ['SAE1.05']
+
+
+def test_fichier_illisible_relu_seulement_apres_changement(serveur, fichier_ics, monkeypatch):
+    lectures = []
+    lire = service_calendrier.sae.lire_fichier_ics
+    monkeypatch.setattr(service_calendrier.sae, 'lire_fichier_ics', lambda nom: lectures.append(nom) or lire(nom))
+
+    fichier_ics.write_bytes(b'BEGIN:VEVENT\nSUMMARY:\xff\xfe\n')
+    for _ in range(5):
+        code, _, corps = requete(serveur, 'groupe=B1')
+        assert code == 200 and json.loads(corps)
+    assert len(lectures) == 1
+
+    shutil.copy(os.path.join(RACINE, 'test.ics'), fichier_ics)
+    assert [e['resume'] for e in json.loads(requete(serveur)[2])] == ['SAE1.05']
+    assert len(lectures) == 2